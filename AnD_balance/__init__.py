@@ -1,3 +1,8 @@
-from .balance import FX_Balance
+VERSION = '0.0.1'
 
-VERSION = '0.0.1'
\ No newline at end of file
+def __getattr__(name):
+    # import the serial driver on first use, so the GUI can start without it
+    if name == 'FX_Balance':
+        from .balance import FX_Balance
+        return FX_Balance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 import serial
 
 from .comm import scan_serial_ports
+from .timing import clock, serial_latency
 
 # a dict of valid commands for A&D FX balances
 commands = {
@@ -101,6 +102,13 @@ class FX_Balance:
     ----------
     port : str, optional
         The serial port to connect to. If not provided, the first USB port found will be used.
+    max_age : float, optional
+        How long, in seconds, cached device state (tare, unit, on/off) is trusted
+        before it is queried again. Default is 5. Taring or zeroing with the balance's
+        front-panel keys sends no serial command, so the cached tare may be this old
+        when `get_tare()` returns it - use `get_tare(refresh=True)` if that matters.
+        If None, cached state is trusted until invalidated by a command sent through
+        this class, which returns a stale zero after any front-panel tare.
         
     Attributes
     ----------
@@ -114,14 +122,23 @@ class FX_Balance:
         The ID of the balance.
     comm : serial.Serial
         The serial communication object.
+    last_read_time : float
+        The monotonic time (see `AnD_balance.timing.Clock`) at which the most recent
+        frame was sent by the balance, corrected for serial transmission time.
+    state : dict
+        Cached device state, as (value, monotonic time) pairs keyed by 'tare', 'unit'
+        and 'on'. Updated from every frame received, including streamed ones.
     """
-    def __init__(self, port=None):
+    def __init__(self, port=None, max_age=5):
         if port is None:
             devices = scan_serial_ports()
             if len(devices) == 1:
                 port = devices[0]['device']
 
-        self.port = port        
+        self.port = port
+        self.max_age = max_age
+        self.last_read_time = None
+        self.state = {}
         self.connect()
     
         self.on()
@@ -140,6 +157,12 @@ class FX_Balance:
         self.serial_number = self.get_serial_number()
         self.id = self.get_id()
         
+    def close(self):
+        """
+        Closes the serial connection to the balance.
+        """
+        self.comm.close()
+    
     def on(self):
         """
         Turns on the balance.
@@ -147,6 +170,7 @@ class FX_Balance:
         This method sends the 'on' command to the balance, which turns it on.
         """
         self._write(commands['on'].encode())
+        self._set_state('on', True)
     
     def off(self):
         """
@@ -155,6 +179,7 @@ class FX_Balance:
         This method sends the 'off' command to the balance, effectively turning it off.
         """
         self._write(commands['off'].encode())
+        self._set_state('on', False)
     
     def _write(self, command):
         """
@@ -174,7 +199,107 @@ class FX_Balance:
 
         self.comm.write(command)
 
-        return decode_AnD(self.comm.read_until(b'\x0D\x0A').decode().strip())
+        return self._read_frame()
+    
+    def _read_frame(self):
+        """
+        Reads and decodes a single frame from the balance, recording when it was sent.
+
+        The frame is stamped on receipt, then corrected for the time taken to
+        transmit it at the line rate - the balance latches the reading before sending.
+
+        Returns
+        -------
+            tuple: The decoded frame, as returned by `decode_AnD`.
+        """
+        raw = self.comm.read_until(b'\x0D\x0A')
+        received = clock.now()
+        if raw:
+            self.last_read_time = received - serial_latency(
+                len(raw), self.comm.baudrate, self.comm.bytesize, self.comm.parity, self.comm.stopbits)
+
+        frame = decode_AnD(raw.decode().strip())
+        self._update_state(frame)
+        return frame
+    
+    def _update_state(self, frame):
+        """
+        Update the cached device state from a decoded frame.
+        """
+        number, unit, status = frame
+        if not isinstance(number, float):
+            return
+        
+        if status == condition_codes['PT']:
+            self._set_state('tare', frame)
+        else:
+            # the balance only reports weights while it is on
+            self._set_state('on', True)
+        if unit:
+            self._set_state('unit', unit)
+    
+    def _set_state(self, key, value):
+        self.state[key] = (value, clock.now())
+    
+    def cached(self, key):
+        """
+        Get a value from the cached device state, without any serial traffic.
+
+        Parameters
+        ----------
+        key : str
+            One of 'tare', 'unit' or 'on'.
+
+        Returns
+        -------
+            The cached value, or None if it is not cached or older than `max_age`.
+        """
+        if key not in self.state:
+            return None
+        value, updated = self.state[key]
+        if self.max_age is not None and clock.now() - updated > self.max_age:
+            return None
+        return value
+    
+    def invalidate(self, *keys):
+        """
+        Discard cached device state, so that it is queried from the balance next time.
+
+        Parameters
+        ----------
+        *keys : str
+            The state to discard. If none are given, all cached state is discarded.
+        """
+        if len(keys) == 0:
+            keys = list(self.state)
+        for key in keys:
+            self.state.pop(key, None)
+    
+    @property
+    def unit(self):
+        """
+        The weighing unit of the balance.
+        """
+        unit = self.cached('unit')
+        if unit is None:
+            _, unit, _ = self.get_weight('immediate')
+        return unit
+    
+    @property
+    def is_on(self):
+        """
+        Whether the balance is turned on, as last set or reported.
+        """
+        return self.cached('on')
+    
+    @property
+    def last_timestamp(self):
+        """
+        The wall-clock time of the most recent frame, as a `datetime`.
+        """
+        if self.last_read_time is None:
+            return None
+        return clock.to_datetime(self.last_read_time)
     
     def get_weight(self, mode='stable'):
             """
@@ -206,6 +331,30 @@ class FX_Balance:
                 case default:
                     raise ValueError("Invalid mode provided - must be one of 'stable', 'immediate' or 'continuous'.")
     
+    def stream(self):
+        """
+        Stream weights continuously from the balance.
+
+        Streaming stops when the generator is closed (e.g. on leaving a `for` loop).
+
+        Yields
+        ------
+        tuple
+            Containing the timestamp (datetime), weight (float), unit (str), and
+            condition of the measurement (str) of each frame.
+        """
+        self.comm.write(commands['get_continuous_weight'].encode() + b'\x0D\x0A')
+        try:
+            while True:
+                weight, unit, status = self._read_frame()
+                if weight is None:
+                    continue
+                yield self.last_timestamp, weight, unit, status
+        finally:
+            self.comm.write(commands['cancel'].encode() + b'\x0D\x0A')
+            self.comm.reset_input_buffer()
+            self.invalidate('tare')
+    
     def get_id(self):
         """
         Get the ID of the balance.
@@ -242,16 +391,26 @@ class FX_Balance:
         """
         return self._write(commands['get_model_name'].encode())[0]
     
-    def get_tare(self):
+    def get_tare(self, refresh=False):
         """
         Get the tare weight from the balance.
 
+        The cached value is returned if it is fresh (see `max_age`), without any serial traffic.
+
+        Parameters
+        ----------
+        refresh : bool, optional
+            If True, always query the balance. Default is False.
+
         Returns
         -------
         tuple
             Containing the zero weight (float), unit (str), and measurement condition (str).
         """
-        return self._write(commands['get_tare'].encode())
+        tare = None if refresh else self.cached('tare')
+        if tare is None:
+            tare = self._write(commands['get_tare'].encode())
+        return tare
     
     def tare(self, value=None, units='g'):
         """
@@ -262,12 +421,15 @@ class FX_Balance:
         tuple
             Containing the zero weight (float), unit (str), and measurement condition (str).
         """
+        self.invalidate('tare')
         if value is None:
             self._write(commands['tare'].encode())
             
         else:
             msg = f'PT:{value:.3f}{units.rjust(3)}'
             self._write(msg.encode())
+            # the new zero is known, so no need to query it
+            self._set_state('tare', (float(value), units, condition_codes['PT']))
         
         return self.get_tare()
     
@@ -275,7 +437,21 @@ class FX_Balance:
         """
         Alias for `tare` method.
         """
-        self.tare(value=value, units=units)
+        return self.tare(value=value, units=units)
+    
+    def rezero(self):
+        """
+        Re-zero the balance.
+        """
+        self.invalidate('tare')
+        self._write(commands['re-zero'].encode())
+    
+    def cancel(self):
+        """
+        Cancel the current command (e.g. a stable weight request or continuous output).
+        """
+        self.invalidate('tare')
+        self._write(commands['cancel'].encode())
     
     def __repr__(self):
         msg = []
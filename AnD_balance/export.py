@@ -0,0 +1,258 @@
+"""
+Streaming export of buoyant weight databases to CSV or Parquet.
+
+Rows are read from one or more `.sqlite` files created by the GUI and written
+in fixed-size chunks, so memory use does not depend on the size of the archive.
+
+Usage
+-----
+    python -m AnD_balance.export weights_2023.sqlite weights_2024.sqlite -o weights.parquet --start 2024-01-01
+"""
+import argparse
+import csv
+import heapq
+import os
+import sqlite3
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+
+TABLE = 'BuoyantWeightData'
+
+# columns of the BuoyantWeightData table (see gui/db.py) and their parquet types
+columns = {
+    'id': 'int64',
+    'sample': 'string',
+    'mass': 'float64',
+    'unit': 'string',
+    'status': 'string',
+    'salinity': 'float64',
+    'temperature': 'float64',
+    'notes': 'string',
+    'timestamp': 'string',
+    'temperature_timestamp': 'string',
+}
+
+def _timestamp(value):
+    # timestamps are stored as datetime.isoformat() strings, so filters must use the
+    # same format to compare correctly (e.g. '2024-01-02 12:00' sorts before '2024-01-02T...')
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.isoformat()
+
+def read_rows(path, start=None, end=None, samples=None, order='id'):
+    """
+    Iterate over rows of a single database.
+
+    Parameters
+    ----------
+    path : str
+        The path to the `.sqlite` file. It is opened read-only.
+    start, end : str or datetime, optional
+        Only return rows with `start <= timestamp < end`. Strings are parsed with
+        `datetime.fromisoformat`.
+    samples : list of str, optional
+        Only return rows whose sample name matches one of these glob patterns.
+    order : str, optional
+        Either 'id' (default) or 'timestamp'. Ordering by id streams rows straight
+        from the table, and matches time order as the GUI inserts rows as they are
+        measured. Ordering by timestamp requires SQLite to sort all matching rows
+        (spilling to temporary files) before the first one is returned, as the
+        timestamp column is not indexed.
+
+    Yields
+    ------
+    tuple
+        One row, with values in the order of `columns`.
+
+    Raises
+    ------
+    ValueError
+        If `order` is not 'id' or 'timestamp', or `start` or `end` is not a valid ISO timestamp.
+    """
+    match order:
+        case 'id':
+            order_by = 'id'
+        case 'timestamp':
+            order_by = 'timestamp, id'
+        case default:
+            raise ValueError("Invalid order provided - must be one of 'id' or 'timestamp'.")
+
+    where = []
+    params = []
+    if start is not None:
+        where.append('timestamp >= ?')
+        params.append(_timestamp(start))
+    if end is not None:
+        where.append('timestamp < ?')
+        params.append(_timestamp(end))
+    if samples:
+        where.append('(' + ' OR '.join(['sample GLOB ?'] * len(samples)) + ')')
+        params.extend(samples)
+
+    uri = Path(path).absolute().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        # older databases lack some columns - export them as empty
+        existing = [row[1] for row in conn.execute(f'PRAGMA table_info({TABLE})')]
+        select = [c if c in existing else f'NULL AS {c}' for c in columns]
+
+        query = f'SELECT {", ".join(select)} FROM {TABLE}'
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+        query += f' ORDER BY {order_by}'
+
+        yield from conn.execute(query, params)
+    finally:
+        conn.close()
+
+def _tag_source(path, rows):
+    source = os.path.basename(path)
+    for row in rows:
+        yield row + (source,)
+
+def iter_chunks(paths, start=None, end=None, samples=None, chunksize=10000):
+    """
+    Iterate over rows from one or more databases in fixed-size chunks.
+
+    A single file is read in id order, which streams without sorting. Rows
+    from multiple files are merged in timestamp order, holding only one pending
+    row per file in memory - but each file must first be sorted by timestamp in
+    SQLite, which costs O(n log n) time and temporary disk space proportional
+    to the matching rows.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        The `.sqlite` file(s) to read.
+    start, end, samples
+        Filters passed to `read_rows`.
+    chunksize : int, optional
+        The maximum number of rows per chunk. Default is 10000.
+
+    Yields
+    ------
+    list of tuple
+        Rows with values in the order of `columns`, followed by the source file
+        name when more than one file is read.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    if len(paths) == 1:
+        rows = read_rows(paths[0], start, end, samples)
+    else:
+        sources = [_tag_source(path, read_rows(path, start, end, samples, order='timestamp')) for path in paths]
+        itime = list(columns).index('timestamp')
+        rows = heapq.merge(*sources, key=lambda row: row[itime])
+
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def export(paths, output, format=None, start=None, end=None, samples=None, chunksize=10000):
+    """
+    Export one or more databases to a CSV or Parquet file.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        The `.sqlite` file(s) to export.
+    output : str
+        The file to write.
+    format : str, optional
+        Either 'csv' or 'parquet'. If not provided, it is inferred from the extension of `output`.
+    start, end : str or datetime, optional
+        Only export rows with `start <= timestamp < end`. Strings are parsed with
+        `datetime.fromisoformat`.
+    samples : list of str, optional
+        Only export rows whose sample name matches one of these glob patterns.
+    chunksize : int, optional
+        The number of rows read and written at a time. Default is 10000.
+
+    Returns
+    -------
+    int
+        The number of rows written.
+
+    Raises
+    ------
+    ValueError
+        If the format is not 'csv' or 'parquet'.
+    ImportError
+        If Parquet output is requested and pyarrow is not installed.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if format is None:
+        format = os.path.splitext(output)[1].lstrip('.').lower()
+
+    names = list(columns)
+    if len(paths) > 1:
+        names.append('source')
+    if format not in ('csv', 'parquet'):
+        raise ValueError("Invalid format provided - must be one of 'csv' or 'parquet'.")
+    if format == 'parquet':
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('pyarrow is required for Parquet export - install it with `pip install pyarrow`.')
+
+    # read the first chunk before creating the output, so that a missing or
+    # invalid database does not leave an empty file behind
+    chunks = iter_chunks(paths, start=start, end=end, samples=samples, chunksize=chunksize)
+    first = next(chunks, None)
+    if first is not None:
+        chunks = chain([first], chunks)
+
+    try:
+        nrows = _write(output, format, names, chunks)
+    except BaseException:
+        # don't leave a partial export if reading fails part way through
+        if os.path.exists(output):
+            os.remove(output)
+        raise
+
+    return nrows
+
+def _write(output, format, names, chunks):
+    nrows = 0
+    match format:
+        case 'csv':
+            with open(output, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(names)
+                for chunk in chunks:
+                    writer.writerows(chunk)
+                    nrows += len(chunk)
+        case 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            types = dict(columns, source='string')
+            schema = pa.schema([(name, types[name]) for name in names])
+            with pq.ParquetWriter(output, schema) as writer:
+                for chunk in chunks:
+                    writer.write_table(pa.Table.from_pylist([dict(zip(names, row)) for row in chunk], schema=schema))
+                    nrows += len(chunk)
+
+    return nrows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m AnD_balance.export', description='Export buoyant weight databases to CSV or Parquet.')
+    parser.add_argument('databases', nargs='+', help='.sqlite file(s) to export. Multiple files are merged in timestamp order.')
+    parser.add_argument('-o', '--output', required=True, help='output file (.csv or .parquet)')
+    parser.add_argument('-f', '--format', choices=['csv', 'parquet'], help='output format - inferred from the output file extension if not given')
+    parser.add_argument('--start', type=datetime.fromisoformat, help='only export measurements at or after this ISO timestamp')
+    parser.add_argument('--end', type=datetime.fromisoformat, help='only export measurements before this ISO timestamp')
+    parser.add_argument('-s', '--sample', action='append', help='only export samples matching this glob pattern (can be repeated)')
+    parser.add_argument('--chunksize', type=int, default=10000, help='rows read and written at a time (default: 10000)')
+    args = parser.parse_args(argv)
+
+    nrows = export(args.databases, args.output, format=args.format, start=args.start, end=args.end, samples=args.sample, chunksize=args.chunksize)
+    print(f'{nrows} rows written to {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import csv
+import io
+import re
+import time
+
+
+def _sample_column(header):
+    """
+    Index of the sample ID column in a header row, or None if it is not a header.
+    """
+    # e.g. 'sample', 'Sample ID', 'sample_name', 'samples' - but not a sample called 'sample1'
+    pattern = re.compile(r'samples?([ _-]?(id|name|no|number|code))?|id')
+    for i, name in enumerate(c.lower() for c in header):
+        if pattern.fullmatch(name):
+            return i
+    return None
+
+
+class SampleQueue:
+    """
+    An ordered queue of sample IDs for batch measurement.
+
+    Parameters
+    ----------
+    samples : list of str, optional
+        The sample IDs to measure, in order.
+
+    Attributes
+    ----------
+    samples : list of str
+        The sample IDs in the queue.
+    position : int
+        The index of the next sample to be measured.
+    times : list of float
+        The `time.monotonic()` times at which each sample was recorded.
+    """
+    def __init__(self, samples=None):
+        self.samples = list(samples or [])
+        self.position = 0
+        self.times = []
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Create a queue from pasted text.
+
+        Each line holds one sample. If the first line is a header naming a sample
+        column (e.g. 'sample', 'Sample ID', 'sample_name' or 'id'), only that column is used.
+        Otherwise only the first column is used. A single line of comma or tab
+        separated IDs is also accepted.
+
+        Parameters
+        ----------
+        text : str
+            The text to parse.
+
+        Returns
+        -------
+        SampleQueue
+        """
+        rows = [[c.strip() for c in row] for row in csv.reader(io.StringIO(text.replace('\t', ',')))]
+        rows = [row for row in rows if any(row)]
+        if len(rows) == 0:
+            return cls()
+
+        icol = _sample_column(rows[0])
+        if icol is not None:
+            rows = rows[1:]
+        elif len(rows) == 1:
+            return cls([c for c in rows[0] if c])
+        else:
+            icol = 0
+
+        return cls([row[icol] for row in rows if len(row) > icol and row[icol]])
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Create a queue from a CSV file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the CSV file. See `from_text` for the accepted layout.
+
+        Returns
+        -------
+        SampleQueue
+        """
+        with open(path, 'r', newline='') as f:
+            return cls.from_text(f.read())
+
+    def __len__(self):
+        return len(self.samples)
+
+    @property
+    def current(self):
+        """
+        The next sample ID to be measured, or None if the queue is finished.
+        """
+        if self.position < len(self.samples):
+            return self.samples[self.position]
+        return None
+
+    @property
+    def done(self):
+        return self.position >= len(self.samples)
+
+    def advance(self):
+        """
+        Mark the current sample as recorded and move to the next one.
+
+        Returns
+        -------
+        str or None
+            The next sample ID, or None if the queue is finished.
+        """
+        if not self.done:
+            self.position += 1
+            self.times.append(time.monotonic())
+        return self.current
+
+    def rate(self):
+        """
+        Measurement rate in samples per hour, based on the recorded samples.
+
+        Returns
+        -------
+        float or None
+            None if fewer than two samples have been recorded.
+        """
+        if len(self.times) < 2:
+            return None
+        elapsed = self.times[-1] - self.times[0]
+        if elapsed <= 0:
+            return None
+        return 3600 * (len(self.times) - 1) / elapsed
+
+
+class PlacementDetector:
+    """
+    Detect sample load and unload events on a stream of balance readings.
+
+    Feed each reading to `update`. A sample is considered loaded when the weight
+    rises above `threshold` (negative readings, e.g. from removing a tared container,
+    never count as loaded), and recorded once the balance reports a stable weight.
+    It must then be removed (weight back below `threshold`) before the next
+    sample can be recorded.
+
+    Parameters
+    ----------
+    threshold : float
+        The weight above which the balance is considered loaded, in the unit
+        reported by the balance.
+    n_stable : int
+        The number of consecutive stable readings required before recording.
+
+    Attributes
+    ----------
+    state : str
+        One of 'empty', 'loaded' or 'recorded'.
+    """
+    def __init__(self, threshold=0.05, n_stable=3):
+        self.threshold = threshold
+        self.n_stable = n_stable
+        self.reset()
+
+    def reset(self):
+        self.state = 'empty'
+        self._stable_count = 0
+
+    def update(self, weight, status):
+        """
+        Process a reading from the balance.
+
+        Parameters
+        ----------
+        weight : float
+            The weight reported by the balance.
+        status : str
+            The measurement condition reported by the balance.
+
+        Returns
+        -------
+        str or None
+            'load' when a sample is placed, 'stable' when a placed sample should be
+            recorded, 'unload' when it is removed, otherwise None.
+        """
+        if weight is None or not isinstance(weight, float):
+            return None
+
+        loaded = weight > self.threshold
+
+        if not loaded:
+            previous = self.state
+            self.reset()
+            if previous != 'empty':
+                return 'unload'
+            return None
+
+        if self.state == 'empty':
+            self.state = 'loaded'
+            self._stable_count = 0
+            return 'load'
+
+        if self.state == 'loaded':
+            if status == 'Stable':
+                self._stable_count += 1
+            else:
+                self._stable_count = 0
+            if self._stable_count >= self.n_stable:
+                self.state = 'recorded'
+                return 'stable'
+
+        return None
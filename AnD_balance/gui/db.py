@@ -11,3 +11,4 @@ class BuoyantWeight(SQLModel, table=True):
     temperature: float = 25.0
     notes: str = ''
     timestamp: str
+    temperature_timestamp: str = ''
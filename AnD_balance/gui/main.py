@@ -1,30 +1,62 @@
 # AnD_balance/gui/balance_gui.py
-from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QLineEdit, QFileDialog, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QHBoxLayout, QShortcut, QVBoxLayout
-from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QTimer
+import time
+import warnings
+_import_time = time.perf_counter()
+
+from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QLineEdit, QFileDialog, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QHBoxLayout, QShortcut, QVBoxLayout, QInputDialog, QMessageBox
+from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QTimer, QSocketNotifier, QThread
 from PyQt5.QtGui import QColor, QPainter, QIcon
 
-from sqlmodel import SQLModel, create_engine, Session
-from .db import BuoyantWeight
+from .batch import SampleQueue, PlacementDetector
 
 import os
+import random
+from glob import glob
+from fnmatch import fnmatch
 from importlib import resources
 import json
-import pandas as pd
-import numpy as np
 from datetime import datetime
+from functools import partial
+
+from AnD_balance.monitor import DeviceMonitor, Backoff
+
+# pandas, sqlmodel and the serial device drivers are slow to import, so are only
+# imported in background workers or on first use, after the window is shown.
+
+# device names used by the balance (USB serial adapter) and temperature probe (Pico)
+BALANCE_PORTS = 'ttyUSB*'
+TEMP_PROBE_PORTS = 'ttyA*'
 
-from AnD_balance.balance import FX_Balance
-from AnD_balance.temperature import PicoTemp
+# target time from process start to the window being shown, in seconds
+STARTUP_TARGET = 1.0
+
+def process_age():
+    """
+    Seconds since this process started, or since this module was imported if
+    the process start time is not available (it is read from /proc on Linux).
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # fields after the command name, which may contain spaces
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _import_time
 
 class DummyBalance:
-    def get_weight(self):
+    last_timestamp = None
+    
+    def get_weight(self, mode='stable'):
+        self.last_timestamp = datetime.now()
         return 1.2345, 'g', 'Stable'
     
 class DummyTemp:
     # def __init__(self):
     #     raise ValueError
     def read(self):
-        return np.random.normal(22,1)
+        return random.gauss(22, 1)
 
 class StatusLED(QWidget):
     clicked = pyqtSignal()  # Define a custom signal
@@ -67,6 +99,109 @@ class StatusLED(QWidget):
     def isOn(self):
         return self.status
 
+class Worker(QThread):
+    """
+    Run a function in a background thread.
+    
+    `succeeded` is emitted with the return value of the function, or `failed`
+    with the exception it raised.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.failed.emit(e)
+            return
+        self.succeeded.emit(result)
+
+class BatchReader(QThread):
+    """
+    Read immediate weights from the balance in a background thread.
+    
+    Each reading is emitted by `reading` with its timestamp. After `max_failures`
+    consecutive empty or failed reads, `failed` is emitted and reading stops.
+    """
+    reading = pyqtSignal(float, str, str, str)
+    failed = pyqtSignal()
+    
+    def __init__(self, balance, interval=100, max_failures=5):
+        super().__init__()
+        self.balance = balance
+        self.interval = interval
+        self.max_failures = max_failures
+        self._running = False
+    
+    def run(self):
+        self._running = True
+        failures = 0
+        while self._running:
+            try:
+                mass, unit, status = self.balance.get_weight(mode='immediate')
+            except Exception:
+                mass = None
+            
+            if isinstance(mass, float):
+                failures = 0
+                self.reading.emit(mass, unit, status, self.balance.last_timestamp.isoformat())
+            else:
+                failures += 1
+                if failures >= self.max_failures:
+                    self.failed.emit()
+                    return
+            self.msleep(self.interval)
+    
+    def stop(self):
+        """
+        Stop reading, and wait for the current read to finish.
+        """
+        self._running = False
+        self.wait()
+
+def open_db(db_path):
+    """
+    Open (or create) a measurement database and read its contents.
+
+    Returns
+    -------
+    tuple
+        Containing the database path, engine and a DataFrame of measurements indexed by id.
+    """
+    import pandas as pd
+    from sqlalchemy import inspect, text
+    from sqlmodel import SQLModel, create_engine
+    from .db import BuoyantWeight  # registers the table with SQLModel.metadata
+    
+    # the engine is created in a worker thread but used from the GUI thread
+    db_engine = create_engine(f'sqlite:///{db_path}', connect_args={'check_same_thread': False})
+    SQLModel.metadata.create_all(db_engine)
+    
+    # databases created before temperature timestamps were recorded lack the column
+    existing = [c['name'] for c in inspect(db_engine).get_columns('BuoyantWeightData')]
+    if 'temperature_timestamp' not in existing:
+        with db_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE BuoyantWeightData ADD COLUMN temperature_timestamp VARCHAR NOT NULL DEFAULT ''"))
+    
+    data = pd.read_sql_table('BuoyantWeightData', db_engine, parse_dates=False)
+    data.set_index('id', inplace=True)
+    return db_path, db_engine, data
+
+def connect_balance():
+    from AnD_balance.balance import FX_Balance
+    return FX_Balance()
+
+def connect_temp_probe():
+    from AnD_balance.temperature import PicoTemp
+    return PicoTemp()
+
 class BalanceGUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -85,55 +220,230 @@ class BalanceGUI(QWidget):
         self.setLayout(self.layout)
         
         self.db_path = None
+        self.db_engine = None
+        self._opened_db_path = None
+        self.db_error = ''
         self.data_table = None
         self.data = None
         
-        self.data_model = BuoyantWeight
+        self.workers = {}
        
         self.make_fields()
-        
-        self.select_db_file()
 
         self.balance = None
         self.temp_probe = None
         
+        self.balance_backoff = Backoff()
         self.balance_timer = QTimer()
+        self.balance_timer.setSingleShot(True)
         self.balance_timer.timeout.connect(self.init_balance)
-        self.balance_timer.start(1000)  # Run init_balance every 1000 milliseconds
         
+        self.temp_probe_backoff = Backoff()
         self.temp_probe_timer = QTimer()
+        self.temp_probe_timer.setSingleShot(True)
         self.temp_probe_timer.timeout.connect(self.init_temp_probe)
-        self.temp_probe_timer.start(1000)
         
+        # watch for devices being plugged in, rather than polling serial ports
+        try:
+            self.device_monitor = DeviceMonitor(patterns=(BALANCE_PORTS, TEMP_PROBE_PORTS))
+            self.device_notifier = QSocketNotifier(self.device_monitor.fileno(), QSocketNotifier.Read)
+            self.device_notifier.activated.connect(self.on_device_event)
+        except OSError:
+            self.device_monitor = None
+        
+        self.batch_queue = SampleQueue()
+        self.batch_detector = PlacementDetector()
+        self.batch_reader = None
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not hasattr(self, 'startup_time'):
+            # open the database and look for devices once the window is on screen
+            QTimer.singleShot(0, self.start)
+    
+    @pyqtSlot()
+    def start(self):
+        self.startup_time = process_age()
+        if self.startup_time > STARTUP_TARGET:
+            warnings.warn(f'window took {self.startup_time:.2f} s to show - target is {STARTUP_TARGET:.2f} s', RuntimeWarning)
+        
+        self.select_db_file()
         self.init_balance()
         self.init_temp_probe()
+    
+    def run_in_background(self, name, message, func, *args, on_success=None, on_failure=None):
+        """
+        Run `func` in a worker thread, showing `message` in the status bar until it finishes.
+        
+        Only one task of each `name` runs at a time - returns False if it is already running.
+        """
+        if name in self.workers:
+            return False
+        
+        worker = Worker(func, *args)
+        if on_success is not None:
+            worker.succeeded.connect(on_success)
+        if on_failure is not None:
+            worker.failed.connect(on_failure)
+        worker.finished.connect(lambda: self.finish_background(name))
+        self.workers[name] = (worker, message)
+        self.update_progress()
+        worker.start()
+        return True
+    
+    def finish_background(self, name):
+        # `finished` is emitted before the thread has exited - wait for it, so the
+        # QThread is not destroyed while still running when the reference is dropped
+        worker, _ = self.workers.pop(name)
+        worker.wait()
+        self.update_progress()
+        
+        if name == 'db' and self.db_path and self._opened_db_path != self.db_path:
+            self.connect_db()
+    
+    def update_progress(self):
+        messages = [message for _, message in self.workers.values()]
+        if self.db_error:
+            messages.append(self.db_error)
+        self.progress_label.setText(' | '.join(messages))
+    
+    @pyqtSlot()
+    def on_device_event(self):
+        for action, device in self.device_monitor.read_events():
+            if fnmatch(os.path.basename(device), BALANCE_PORTS):
+                if action == 'add' and self.balance is None:
+                    self.balance_backoff.reset()
+                    self.balance_timer.start(int(1000 * self.balance_backoff.next()))
+                elif action == 'remove' and self.balance is not None and self.balance.port == device:
+                    self.stop_batch_reader()
+                    self.close_device(self.balance)
+                    self.balance = None
+                    self.batch_checkbox.setChecked(False)
+                    self.toggle_batch()
+                    self.balance_LED.off()
+                    self.balance_LED.setToolTip('Disconnected - click to reconnect.')
+            
+            elif fnmatch(os.path.basename(device), TEMP_PROBE_PORTS):
+                if action == 'add' and self.temp_probe is None:
+                    self.temp_probe_backoff.reset()
+                    self.temp_probe_timer.start(int(1000 * self.temp_probe_backoff.next()))
+                elif action == 'remove' and self.temp_probe is not None and self.temp_probe.port == device:
+                    self.close_device(self.temp_probe)
+                    self.temp_probe = None
+                    self.temp_LED.off()
+                    self.temp_LED.setToolTip('Disconnected - click to reconnect.')
+                    self.disable_auto_temp()
+    
+    def close_device(self, device):
+        # release the serial port, so a re-plugged device comes back on the same node
+        try:
+            device.close()
+        except OSError:
+            pass
+    
+    def closeEvent(self, event):
+        self.balance_timer.stop()
+        self.temp_probe_timer.stop()
+        self.stop_batch_reader()
+        
+        # a device connection can take several serial timeouts - wait for running
+        # workers, so their QThreads are not destroyed while still running
+        for worker, _ in self.workers.values():
+            worker.succeeded.disconnect()
+            worker.failed.disconnect()
+            worker.finished.disconnect()
+            worker.wait()
+        self.workers = {}
+        
+        if self.device_monitor is not None:
+            self.device_notifier.setEnabled(False)
+            self.device_monitor.close()
+        for device in (self.balance, self.temp_probe):
+            if device is not None:
+                self.close_device(device)
+        super().closeEvent(event)
+    
+    def schedule_retry(self, timer, backoff, pattern):
+        """
+        Retry a failed connection after a backoff delay.
+        
+        If devices are being monitored, only retry while a candidate port exists -
+        otherwise wait for the monitor to report one being plugged in.
+        """
+        if self.device_monitor is not None and len(glob(os.path.join('/dev', pattern))) == 0:
+            return
+        timer.start(int(1000 * backoff.next()))
         
+    @pyqtSlot()
     def init_balance(self):
-        try:
-            self.balance = FX_Balance()
-            self.balance_LED.on()
-            self.balance_LED.setToolTip('Connected - click to reconnect.')
-            self.balance_timer.stop()
-            print('balance initialized')
+        self.run_in_background('balance', 'Connecting to balance...', connect_balance,
+                               on_success=self.on_balance_connected, on_failure=self.on_balance_failed)
+    
+    def on_balance_connected(self, balance):
+        if self.balance is not None:
+            # reconnected - release the old connection, which batch mode may be using
+            self.batch_checkbox.setChecked(False)
+            self.toggle_batch()
+            self.close_device(self.balance)
+        self.balance = balance
+        self.balance_LED.on()
+        self.balance_LED.setToolTip('Connected - click to reconnect.')
+        self.balance_timer.stop()
+        self.balance_backoff.reset()
+        print('balance initialized')
+    
+    def on_balance_failed(self, error):
+        if self.balance is not None and self.balance_LED.isOn():
+            # a manual reconnect failed, but the existing connection still works
+            self.balance_LED.setToolTip('Reconnect failed - using existing connection. Click to retry.')
             return
-        except:
-            pass
         
+        if self.balance is not None:
+            self.batch_checkbox.setChecked(False)
+            self.toggle_batch()
+            self.close_device(self.balance)
+            self.balance = None
+        self.balance_LED.off()
+        self.balance_LED.setToolTip('Disconnected - click to reconnect.')
+        self.schedule_retry(self.balance_timer, self.balance_backoff, BALANCE_PORTS)
+    
+    @pyqtSlot()
     def init_temp_probe(self):
-        try:
-            # self.temp_probe = DummyTemp()
-            self.temp_probe = PicoTemp()
-            self.temp_LED.on()
-            self.temp_LED.setToolTip(f'Connected on {self.temp_probe.port} - click to reconnect.')
-            self.temp_probe_timer.stop()
-            print(f'temp probe initialized on {self.temp_probe.port}')
+        # connect_temp_probe = DummyTemp
+        self.run_in_background('temp_probe', 'Connecting to temperature probe...', connect_temp_probe,
+                               on_success=self.on_temp_probe_connected, on_failure=self.on_temp_probe_failed)
+    
+    def on_temp_probe_connected(self, temp_probe):
+        if self.temp_probe is not None:
+            self.close_device(self.temp_probe)
+        self.temp_probe = temp_probe
+        self.temp_LED.on()
+        self.temp_LED.setToolTip(f'Connected on {self.temp_probe.port} - click to reconnect.')
+        self.temp_probe_timer.stop()
+        self.temp_probe_backoff.reset()
+        self.temperature_checkbox.setEnabled(True)
+        print(f'temp probe initialized on {self.temp_probe.port}')
+    
+    def on_temp_probe_failed(self, error):
+        if self.temp_probe is not None and self.temp_LED.isOn():
+            # a manual reconnect failed, but the existing connection still works
+            self.temp_LED.setToolTip(f'Reconnect failed - using existing connection on {self.temp_probe.port}. Click to retry.')
             return
-        except:
+        
+        if self.temperature_checkbox.isEnabled():
             print('temp failed')
-            self.temperature_checkbox.setChecked(False)
-            self.temperature_checkbox.setEnabled(False)
-            self.toggle_auto_temp()
-            pass
+            self.disable_auto_temp()
+        if self.temp_probe is not None:
+            self.close_device(self.temp_probe)
+            self.temp_probe = None
+        self.temp_LED.off()
+        self.temp_LED.setToolTip('Disconnected - click to reconnect.')
+        self.schedule_retry(self.temp_probe_timer, self.temp_probe_backoff, TEMP_PROBE_PORTS)
+    
+    def disable_auto_temp(self):
+        self.temperature_checkbox.setChecked(False)
+        self.temperature_checkbox.setEnabled(False)
+        self.toggle_auto_temp()
     
     def make_fields(self):
         # first row: database selection
@@ -207,8 +517,40 @@ class BalanceGUI(QWidget):
         
         self.layout.addLayout(row_layout)
         
+        # fifth row: batch measurement queue
+        row_layout = QHBoxLayout()
+        
+        self.batch_load_button = QPushButton('Load Queue')
+        self.batch_load_button.clicked.connect(self.load_batch_queue)
+        row_layout.addWidget(self.batch_load_button)
+        
+        self.batch_paste_button = QPushButton('Paste Queue')
+        self.batch_paste_button.clicked.connect(self.paste_batch_queue)
+        row_layout.addWidget(self.batch_paste_button)
+        
+        self.batch_checkbox = QCheckBox('batch mode')
+        self.batch_checkbox.setEnabled(False)
+        self.batch_checkbox.clicked.connect(self.toggle_batch)
+        row_layout.addWidget(self.batch_checkbox)
+        
+        self.batch_threshold_label = QLabel('Load threshold:')
+        self.batch_threshold_field = QLineEdit('0.05')
+        self.batch_threshold_field.setToolTip('Weight above which a sample is detected as loaded, in balance units.')
+        self.batch_threshold_field.editingFinished.connect(self.set_batch_threshold)
+        row_layout.addWidget(self.batch_threshold_label)
+        row_layout.addWidget(self.batch_threshold_field)
+        
+        self.batch_label = QLabel('No queue loaded')
+        row_layout.addWidget(self.batch_label)
+        row_layout.setStretchFactor(self.batch_label, 1)
+        
+        self.layout.addLayout(row_layout)
+        
         # # bottom bar: status LEDs
         self.status_bar = QHBoxLayout()
+        
+        self.progress_label = QLabel('')
+        self.status_bar.addWidget(self.progress_label)
         self.status_bar.addStretch()
         
         self.temp_LED_label = QLabel('Temperature Probe:')
@@ -230,19 +572,28 @@ class BalanceGUI(QWidget):
 
     @pyqtSlot()
     def read(self):
-        if self.balance is None:
+        if self.balance is None or self.batch_reader is not None:
             return
         
         sample_name = self.get_sample_name()
-        timestamp = datetime.now().isoformat()
         
         try:
             mass, unit, status = self.balance.get_weight()
         except:
             self.balance_LED.off()
             return
+        if mass is None:
+            return
         
-        temperature = self.read_temp()
+        # timestamped on receipt of the reading, corrected for serial latency
+        timestamp = self.balance.last_timestamp.isoformat()
+        self.record(sample_name, mass, unit, status, timestamp)
+    
+    def record(self, sample_name, mass, unit, status, timestamp):
+        """
+        Save a measurement to the database. Returns True if it was saved.
+        """
+        temperature, temperature_timestamp = self.read_temp()
         
         new_data = {
             'sample': sample_name,
@@ -253,46 +604,157 @@ class BalanceGUI(QWidget):
             'temperature': temperature,
             'notes': '',
             'timestamp': timestamp,
+            'temperature_timestamp': temperature_timestamp,
         }
     
-        if sample_name != '' and mass is not None:
+        if sample_name != '' and mass is not None and self.data is not None:
+            from sqlmodel import Session
+            from .db import BuoyantWeight
+            
             self.fill_line(new_data)
                         
             self.data.loc[self.id_current] = new_data
             
             with Session(self.db_engine) as db:
-                db.add(self.data_model(**new_data))
+                db.add(BuoyantWeight(**new_data))
                 db.commit()
             
             self.id_current += 1
             
             self.insert_row()
+            return True
+        
+        return False
+    
+    def load_batch_queue(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Load Sample Queue', filter='CSV File (*.csv *.txt)')
+        if path:
+            self.set_batch_queue(SampleQueue.from_csv(path))
+    
+    def paste_batch_queue(self):
+        text, ok = QInputDialog.getMultiLineText(self, 'Paste Sample Queue', 'Sample IDs (one per line):')
+        if ok:
+            self.set_batch_queue(SampleQueue.from_text(text))
+    
+    def set_batch_queue(self, queue):
+        self.batch_queue = queue
+        self.batch_detector.reset()
+        self.update_batch_enabled()
+    
+    def update_batch_enabled(self):
+        # batch mode needs a queue and an open database to record into
+        enabled = len(self.batch_queue) > 0 and self.data is not None
+        self.batch_checkbox.setEnabled(enabled)
+        if not enabled:
+            self.batch_checkbox.setChecked(False)
+        self.toggle_batch()
+    
+    @pyqtSlot()
+    def set_batch_threshold(self):
+        try:
+            self.batch_detector.threshold = float(self.batch_threshold_field.text())
+        except ValueError:
+            self.batch_threshold_field.setText(f'{self.batch_detector.threshold}')
+    
+    @pyqtSlot()
+    def toggle_batch(self):
+        if self.batch_checkbox.isChecked() and not self.batch_queue.done and self.data is not None and self.balance is not None:
+            if self.batch_reader is None:
+                self.batch_detector.reset()
+                # weights are read off the GUI thread, so the window stays responsive
+                self.batch_reader = BatchReader(self.balance)
+                self.batch_reader.reading.connect(self.on_batch_reading)
+                self.batch_reader.failed.connect(self.on_batch_failed)
+                self.batch_reader.start()
+        else:
+            self.batch_checkbox.setChecked(False)
+            self.stop_batch_reader()
+        # the balance is busy while batch mode is running
+        self.read_button.setEnabled(self.batch_reader is None and self.data is not None)
+        self.tare_button.setEnabled(self.batch_reader is None)
+        self.update_batch_label()
+    
+    def stop_batch_reader(self):
+        if self.batch_reader is not None:
+            self.batch_reader.reading.disconnect()
+            self.batch_reader.failed.disconnect()
+            self.batch_reader.stop()
+            self.batch_reader = None
+    
+    @pyqtSlot()
+    def on_batch_failed(self):
+        self.batch_checkbox.setChecked(False)
+        self.toggle_batch()
+        self.balance_LED.off()
+        self.balance_LED.setToolTip('Not responding - click to reconnect.')
+        self.batch_label.setText('Balance not responding - batch mode stopped')
+    
+    def update_batch_label(self):
+        if len(self.batch_queue) == 0:
+            self.batch_label.setText('No queue loaded')
+            return
+        
+        msg = f'{self.batch_queue.position}/{len(self.batch_queue)} done'
+        if self.batch_queue.done:
+            msg = f'Queue finished - {msg}'
+        else:
+            msg = f'Next: {self.batch_queue.current} ({msg})'
+        
+        rate = self.batch_queue.rate()
+        if rate is not None:
+            msg += f' | {rate:.1f} samples/h'
+        self.batch_label.setText(msg)
+    
+    @pyqtSlot(float, str, str, str)
+    def on_batch_reading(self, mass, unit, status, timestamp):
+        if self.batch_reader is None or self.batch_queue.done or self.data is None:
+            return
+        
+        event = self.batch_detector.update(mass, status)
+        if event == 'stable':
+            sample_name = self.batch_queue.current
+            self.data_table.setItem(0, 0, QTableWidgetItem(sample_name))
+            if not self.record(sample_name, mass, unit, status, timestamp):
+                # not saved - wait for the sample to be removed and placed again
+                self.batch_label.setText(f'Failed to record {sample_name} - remove and replace it')
+                return
+            self.batch_queue.advance()
+            if self.batch_queue.done:
+                self.batch_checkbox.setChecked(False)
+                self.toggle_batch()
+            self.update_batch_label()
 
     @pyqtSlot()
     def tare_balance(self):
         # TODO: this is not working?
-        if self.balance is None:
+        if self.balance is None or self.batch_reader is not None:
             return
         self.balance.tare()
 
     @pyqtSlot()
     def read_temp(self):
+        """
+        Returns the temperature and, if it was read from the probe, when it was read.
+        """
         if self.temp_probe is None:
-            return
+            return None, ''
         
+        timestamp = ''
         if self.temperature_checkbox.isChecked():
             try:
                 temperature = self.temp_probe.read()
             except:
                 self.temp_LED.off()
                 self.toggle_auto_temp()
-                return
+                return None, ''
+            # stored with each row, to align temperature with the weight reading
+            timestamp = self.temp_probe.last_timestamp.isoformat()
         else:
             temperature = float(self.temperature_field.text())
         
         print(temperature)
         self.temperature_field.setText(f'{temperature:.2f}')
-        return temperature
+        return temperature, timestamp
     
     def toggle_auto_temp(self):
         self.temperature_field.setEnabled(not self.temperature_checkbox.isChecked())
@@ -311,6 +773,7 @@ class BalanceGUI(QWidget):
         self.data_table.setItem(0, 4, QTableWidgetItem(f"{data['salinity']:.2f}"))
         self.data_table.setItem(0, 5, QTableWidgetItem(f"{data['temperature']:.2f}"))
         self.data_table.setItem(0, 6, QTableWidgetItem(data['timestamp']))
+        self.data_table.setItem(0, 7, QTableWidgetItem(data['temperature_timestamp']))
     
     def get_sample_name(self):
         sample_name = self.data_table.item(0, 0)
@@ -338,12 +801,10 @@ class BalanceGUI(QWidget):
         self.data_table.setHorizontalHeaderLabels(colNames)
         
         # add data to the table
-        prow = 0
         if nrow > 0:
-            for i, row_data in self.data.iloc[::-1].iterrows():
-                for j, c in enumerate(colNames):
-                    self.data_table.setItem(prow, j, QTableWidgetItem(str(row_data[c])))
-                prow += 1
+            for prow, row_data in enumerate(self.data[colNames].iloc[::-1].astype(str).values):
+                for j, value in enumerate(row_data):
+                    self.data_table.setItem(prow, j, QTableWidgetItem(value))
         self.data_table.setVerticalHeaderLabels(self.data.index[::-1].astype(str))
         
         self.insert_row()
@@ -391,18 +852,42 @@ class BalanceGUI(QWidget):
         if self.db_path:            
             self.db_uri = f'sqlite:///{self.db_path}'
             print(self.db_uri)
-            self.db_engine = create_engine(self.db_uri)
-            SQLModel.metadata.create_all(self.db_engine)
-            self.data = pd.read_sql_table('BuoyantWeightData', self.db_engine, parse_dates=False)
-            self.data.set_index('id', inplace=True)
-            self.id_current = self.data.index.max() + 1
-            if np.isnan(self.id_current):
-                self.id_current = 0
-
+            # opened in the background - reading is disabled until it has loaded
+            self.data = None
+            self.db_error = ''
+            self.data_table.setRowCount(0)
+            self.read_button.setEnabled(False)
+            self.update_batch_enabled()
+            
+            # if a database is already loading, this one is opened when it finishes
+            self.run_in_background('db', f'Opening {os.path.basename(self.db_path)}...', open_db, self.db_path,
+                                   on_success=self.on_db_loaded, on_failure=partial(self.on_db_failed, self.db_path))
         else:
             self.data = None
-        
+            self.populate_data_table()
+    
+    def on_db_loaded(self, result):
+        db_path, db_engine, data = result
+        self._opened_db_path = db_path
+        if db_path != self.db_path:
+            return  # a different database was selected while loading
+        
+        self.db_engine, self.data = db_engine, data
+        self.id_current = 0 if len(self.data) == 0 else int(self.data.index.max()) + 1
+        self.read_button.setEnabled(True)
         self.populate_data_table()
+        self.update_batch_enabled()
+    
+    def on_db_failed(self, db_path, error):
+        self._opened_db_path = db_path
+        print(f'failed to open {db_path}: {error}')
+        if db_path != self.db_path:
+            return
+        
+        # nothing can be recorded, but another database can be opened
+        self.db_error = f'Could not open {os.path.basename(db_path)}'
+        self.update_progress()
+        QMessageBox.warning(self, 'Database Error', f'Could not open {db_path}:\n\n{error}\n\nOpen or create another database to record measurements.')
  
     def disconnectDB(self):
         self.db_engine.disconnect()
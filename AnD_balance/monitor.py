@@ -0,0 +1,129 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+from fnmatch import fnmatch
+
+# inotify constants from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class DeviceMonitor:
+    """
+    Watch a device directory for serial ports being added or removed.
+
+    Uses Linux inotify, so no polling is needed: the file descriptor returned by
+    `fileno` becomes readable only when something changes, and can be handed to
+    an event loop (e.g. `select` or a `QSocketNotifier`).
+
+    Parameters
+    ----------
+    path : str, optional
+        The directory to watch. Default is '/dev'.
+    patterns : tuple of str, optional
+        Glob patterns of device names to report. Default is ('tty*',).
+
+    Raises
+    ------
+    OSError
+        If inotify is not available on this platform.
+    """
+    def __init__(self, path='/dev', patterns=('tty*',)):
+        self.path = path
+        self.patterns = patterns
+
+        libc_name = ctypes.util.find_library('c')
+        if libc_name is None:
+            raise OSError('libc not found - device monitoring is not available')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify is not available on this platform')
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        wd = libc.inotify_add_watch(self._fd, path.encode(), IN_CREATE | IN_DELETE | IN_ATTRIB)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno), path)
+
+    def fileno(self):
+        return self._fd
+
+    def read_events(self):
+        """
+        Read all pending events without blocking.
+
+        Returns
+        -------
+        list of tuple
+            Containing the action ('add' or 'remove') and full device path for each
+            event matching `patterns`. Permission changes on an existing device
+            (as made by udev after creating the node) are reported as 'add'.
+        """
+        events = []
+        while True:
+            try:
+                buffer = os.read(self._fd, 4096)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                offset += _EVENT.size
+                name = buffer[offset:offset + length].rstrip(b'\0').decode()
+                offset += length
+
+                if not any(fnmatch(name, p) for p in self.patterns):
+                    continue
+                action = 'remove' if mask & IN_DELETE else 'add'
+                events.append((action, os.path.join(self.path, name)))
+        return events
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class Backoff:
+    """
+    Exponential backoff delays for connection retries.
+
+    Parameters
+    ----------
+    initial : float, optional
+        The first delay, in seconds. Default is 0.5.
+    maximum : float, optional
+        The longest delay, in seconds. Default is 60.
+    factor : float, optional
+        The multiplier applied after each delay. Default is 2.
+    """
+    def __init__(self, initial=0.5, maximum=60, factor=2):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        self.delay = self.initial
+
+    def next(self):
+        """
+        Return the next delay, in seconds, and increase the following one.
+        """
+        delay = self.delay
+        self.delay = min(self.delay * self.factor, self.maximum)
+        return delay
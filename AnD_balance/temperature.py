@@ -1,6 +1,8 @@
 from glob import glob
 import serial
 
+from .timing import clock
+
 class PicoTemp:
     TERMINATOR = '\r'.encode('UTF8')
 
@@ -16,6 +18,7 @@ class PicoTemp:
                 raise ValueError(f'Multiple serial ports found - please specify one of {ports}')
         
         self.port = port
+        self.last_read_time = None
         
         self.pico = serial.Serial(port, 115200, timeout=timeout)
 
@@ -31,8 +34,18 @@ class PicoTemp:
         temp = self.receive()
         return float(temp)
 
+    @property
+    def last_timestamp(self):
+        if self.last_read_time is None:
+            return None
+        return clock.to_datetime(self.last_read_time)
+
     def receive(self) -> str:
         line = self.pico.read_until(self.TERMINATOR)
+        if line:
+            # the Pico is a USB CDC device, so the nominal baud rate says nothing about
+            # transfer time - unlike the balance, no latency correction is applied
+            self.last_read_time = clock.now()
         return line.decode('UTF8').strip()
 
     def close(self):
@@ -0,0 +1,109 @@
+import time
+from collections import deque
+from datetime import datetime
+
+
+def serial_latency(nbytes, baudrate, bytesize=8, parity='N', stopbits=1):
+    """
+    Time taken to transmit a frame over a serial line.
+
+    Parameters
+    ----------
+    nbytes : int
+        The length of the frame, including line terminators.
+    baudrate : int
+        The line rate in bits per second.
+    bytesize, parity, stopbits
+        The serial frame format, as passed to `serial.Serial`.
+
+    Returns
+    -------
+    float
+        The transmission time in seconds.
+    """
+    bits = 1 + bytesize + (parity != 'N') + stopbits  # start bit + data + parity + stop
+    return nbytes * bits / baudrate
+
+
+class Clock:
+    """
+    Timestamps from a monotonic clock, mapped to wall-clock time.
+
+    Readings are stamped with `now()`, which is monotonic and high resolution, and
+    converted to wall-clock time afterwards. The mapping is a least-squares fit over
+    recent (monotonic, wall-clock) pairs, so drift between the two clocks over long
+    runs is corrected without wall-clock steps reordering readings.
+
+    Parameters
+    ----------
+    window : int, optional
+        The number of synchronisation pairs used for the fit. Default is 32.
+    resync : float, optional
+        The interval, in seconds, after which a new synchronisation pair is taken. Default is 60.
+    """
+    def __init__(self, window=32, resync=60):
+        self.resync = resync
+        self._pairs = deque(maxlen=window)
+        self.sync()
+
+    @staticmethod
+    def now():
+        """
+        The current monotonic time, in seconds.
+        """
+        return time.monotonic_ns() * 1e-9
+
+    def sync(self):
+        """
+        Record a (monotonic, wall-clock) pair and update the mapping between them.
+        """
+        # bracket the wall-clock read to take the midpoint of the monotonic time
+        m0 = time.monotonic_ns()
+        wall = time.time_ns()
+        m1 = time.monotonic_ns()
+        self._pairs.append(((m0 + m1) * 0.5e-9, wall * 1e-9))
+        self._fit()
+
+    def _fit(self):
+        mono0, wall0 = self._pairs[0]
+        n = len(self._pairs)
+        x = [m - mono0 for m, _ in self._pairs]
+        y = [w - wall0 for _, w in self._pairs]
+        xmean = sum(x) / n
+        ymean = sum(y) / n
+        sxx = sum((xi - xmean) ** 2 for xi in x)
+
+        if sxx > 0:
+            self.rate = sum((xi - xmean) * (yi - ymean) for xi, yi in zip(x, y)) / sxx
+        else:
+            self.rate = 1.0
+        self._mono_ref = mono0 + xmean
+        self._wall_ref = wall0 + ymean
+
+    def to_wall(self, mono):
+        """
+        Convert a monotonic time to wall-clock time.
+
+        Parameters
+        ----------
+        mono : float
+            A time returned by `now()`.
+
+        Returns
+        -------
+        float
+            Seconds since the epoch.
+        """
+        if self.now() - self._pairs[-1][0] > self.resync:
+            self.sync()
+        return self._wall_ref + (mono - self._mono_ref) * self.rate
+
+    def to_datetime(self, mono):
+        """
+        Convert a monotonic time to a local `datetime`.
+        """
+        return datetime.fromtimestamp(self.to_wall(mono))
+
+
+# shared clock, so that readings from different devices are on the same time base
+clock = Clock()